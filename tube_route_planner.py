@@ -9,18 +9,65 @@ See data at https://commons.wikimedia.org/wiki/London_Underground_geographic_map
 '''
 
 from __future__ import annotations  # for self-referential type hints
-from typing import Any, Self, Sequence  # more type hints
-from collections import defaultdict as ddict  # data structure to store adjacency list
-from math import radians, sqrt, cos, inf  # converting spherical (latitude, longitude)
-from queue import PriorityQueue  # data structure for Dijkstra's Algorithm
+from typing import Any, Callable, NamedTuple, Self, Sequence  # more type hints
+from dataclasses import dataclass  # lightweight record for graph arrays
+from functools import lru_cache  # memoize repeated shortest path queries
+from itertools import accumulate, groupby  # CSR offsets and split path into runs of same line
+from math import radians, sqrt, cos, sin, asin, inf  # converting spherical (latitude, longitude)
+from math import dist as euclidean  # straight line distance between two points
+import heapq  # min heap data structure for Dijkstra's Algorithm
 import csv  # module for parsing and extracting CSV files
 import os  # extract current python file directory
 
+_BASE_DIR = os.path.dirname(os.path.realpath(__file__))  # directory of current python file
+
+
+class Line(NamedTuple):
+  'London Underground line record with fields accessed by attribute instead of dictionary key.'
+  name: str
+  colour: str  # hex colour without leading '#'
+  stripe: str  # hex colour of stripe or NULL
+
+
+class Stations(NamedTuple):
+  'London Underground stations stored as columns, where index i of every column is same station.'
+  id: list[int]
+  lat: list[float]
+  lon: list[float]
+  name: list[str]
+  zone: list[float]
+  lines: list[int]  # total number of lines through station
+  rail: list[int]  # 1 if station connects to national rail else 0
+
+
+class Routes(NamedTuple):
+  'London Underground routes stored as columns of undirected edges, where index i is same edge.'
+  station1: list[int]
+  station2: list[int]
+  line: list[int]
+
 
 class ImportCSV():
   'Import data from CSV files and store into data structures.'
-  
-  def lines(file_path: str) -> dict[int, dict[str, str]]:
+
+  def columns(file_path: str, dtype: dict[str, Callable[[str], Any]]) -> list[list[Any]]:
+    '''
+    Import CSV file as columns. Each column named in dtype is converted once as a whole with
+    map() instead of converting one cell at a time per row, and columns not in dtype are skipped.
+
+    :param: file_path is path of CSV file relative to this python file
+    :param: dtype maps fieldname of each column to keep onto function converting its values
+    :return: list of converted columns in same order as dtype
+    '''
+    full_path = os.path.join(_BASE_DIR, file_path)
+
+    with open(full_path) as csv_file:
+      reader = csv.reader(csv_file)
+      fieldnames = next(reader)  # line1 of fieldnames
+      columns = dict(zip(fieldnames, zip(*reader)))  # transpose rows into columns
+    return [list(map(convert, columns[name])) for name, convert in dtype.items()]
+
+  def lines(file_path: str) -> dict[int, Line]:
     '''
     Import London Underground Lines
   
@@ -28,62 +75,45 @@ class ImportCSV():
     "line","name","colour","stripe"
     1,"Bakerloo Line","ab6612",NULL
     '''
-    # Get directory of current python file
-    dir_path = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(sys.argv[0])))
-    full_path = os.path.join(dir_path, file_path)
+    dtype = {'line': int, 'name': str, 'colour': str, 'stripe': str}
+    line, name, colour, stripe = ImportCSV.columns(file_path, dtype)
+    return dict(zip(line, map(Line, name, colour, stripe)))
 
-    results = {}
-    with open(full_path) as csv_file:
-      reader = csv.DictReader(csv_file)  # by default DictReader does not read line1 of fieldnames
-      line, name, colour, stripe = reader.fieldnames
-      for row in reader:
-        # results[int(row[line])] = (row[name], row[colour], row[stripe])  # dict[int, tuple(str)]
-        results[int(row[line])] = {name: row[name], colour: row[colour], stripe: row[stripe]}
-    return results
-
-  def stations(file_path: str) -> dict[int, dict[str, Any]]:
+  def stations(file_path: str) -> Stations:
     '''
-    Import London Underground Stations
+    Import London Underground Stations as columns, where row i of every column is the same station
   
     CSV format:
     "id","latitude","longitude","name","display_name","zone","total_lines","rail"
     1,51.5028,-0.2801,"Acton Town","Acton<br />Town",3,2,0
     '''
-    # Get directory of current python file
-    dir_path = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(sys.argv[0])))
-    full_path = os.path.join(dir_path, file_path)
+    dtype = {'id': int, 'latitude': float, 'longitude': float, 'name': str, 'zone': float,
+             'total_lines': int, 'rail': int}
+    return Stations(*ImportCSV.columns(file_path, dtype))
 
-    results = {}
-    with open(full_path) as csv_file:
-      reader = csv.DictReader(csv_file)  # by default DictReader does not read line1 of fieldnames
-      id, lat, lon, name, dname, zone, lines, rail = reader.fieldnames
-      for r in reader:  # for row in reader object
-        # results[int(row[line])] = (float(r[lat]), float(r[lon]), r[name], float(r[zone]),
-        # int(r[lines]), int(r[rail]))  # dict[int, tuple(Any)]
-        results[int(r[id])] = {'lat': float(r[lat]), 'lon': float(r[lon]), name: r[name],
-                               zone: float(r[zone]), 'lines': int(r[lines]), rail: int(r[rail])}
-    return results
-
-  def routes(file_path: str) -> dict[int, dict[int, int]]:
+  def routes(file_path: str) -> Routes:
     '''
-    Import London Underground Routes as Undirected Edges
+    Import London Underground Routes as columns of Undirected Edges
   
     CSV format:
     "station1","station2","line"
     11,163,1
     '''
-    # Get directory of current python file
-    dir_path = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(sys.argv[0])))
-    full_path = os.path.join(dir_path, file_path)
-  
-    results = ddict(dict)
-    with open(full_path) as csv_file:
-      reader = csv.DictReader(csv_file)  # by default DictReader does not read line1 of fieldnames
-      station1, station2, line = reader.fieldnames
-      for row in reader:
-        results[int(row[station1])][int(row[station2])] = int(row[line])
-        results[int(row[station2])][int(row[station1])] = int(row[line])
-    return dict(results)
+    dtype = {'station1': int, 'station2': int, 'line': int}
+    return Routes(*ImportCSV.columns(file_path, dtype))
+
+
+@dataclass(frozen=True, eq=False)  # compare and hash by identity so graph can be a cache key
+class Graph():
+  'Adjacency list stored as compressed sparse row (CSR) arrays indexed by dense vertex ids.'
+  ids: list[int]  # station id of each vertex, where vertices are numbered 0 to N-1
+  index: dict[int, int]  # vertex of each station id
+  indptr: list[int]  # edges of vertex v are stored at range(indptr[v], indptr[v + 1])
+  neighbors: list[int]  # vertex at other end of each edge
+  weights: list[int]  # distance in cm of each edge, stored as integer for exact comparison
+  line_ids: list[int]  # line id of each edge
+  lat: list[float]  # latitude of each vertex
+  lon: list[float]  # longitude of each vertex
 
 
 def dist_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -102,53 +132,241 @@ def dist_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
   return d
 
 
-def graph_dijkstra(g: dict[int, dict], start: int, end: int) -> tuple[dict[str, float], list[int]]:
+def dist_km_vec(lat1: Sequence[float], lon1: Sequence[float], lat2: Sequence[float],
+                lon2: Sequence[float]) -> list[float]:
   '''
-  Use priorityqueue (min heap) for Dijkstra's algorithm to traverse graph, g, and find shortest
-  weighted path. Assume a transfer penalty and use geographical distance for edge weights.
+  Calculate distances between many pairs of points given as columns of GPS coordinates, using
+  same equirectangular approximation as dist_km. Element i of each column is the ith pair, and
+  columns are consumed with map() so there is no Python level loop per pair.
 
-  :param: g is adjacency list of london underground routes
-  :param: start = starting station, end = ending station
-  :return: dictionary of shortest edge distances, list vertices for shortest path
+  :param: latitude and longitude columns in decimal degrees for first and second points
+  :return: list of distances in kilometers
+  '''
+  return list(map(dist_km, lat1, lon1, lat2, lon2))
+
+
+def dist_matrix_km(lat: Sequence[float], lon: Sequence[float]) -> list[list[float]]:
+  '''
+  Calculate great circle distance between every pair of points, e.g. for nearest station queries.
+  Convert each point once to a 3D unit vector so each pair only needs the chord (straight line)
+  distance between vectors, which math.dist calculates in C, and then convert chord to arc length.
+  Chord is used instead of arccos of dot product since arccos loses precision for short distances.
+
+  :param: columns of latitude and longitude in decimal degrees
+  :return: N x N matrix as list of rows of distances in kilometers
   '''
+  points = [(cos(phi) * cos(lam), cos(phi) * sin(lam), sin(phi))
+            for phi, lam in zip(map(radians, lat), map(radians, lon))]
+  return [[2 * 6371 * asin(euclidean(p, q) / 2) for q in points] for p in points]
+
+
+def build_graph(routes: Routes, stations: Stations) -> Graph:
+  '''
+  Build compressed sparse row (CSR) arrays from route columns so Dijkstra's algorithm iterates over
+  neighbors with sequential list indexing instead of nested dictionary lookups. Stations are
+  renumbered as dense vertex ids 0 to N-1 so they can index the arrays directly. Every route is
+  listed in both directions, then edges are sorted by vertex and counted per vertex to give
+  offsets, so no adjacency dictionaries are built. Station pairs served by more than one line keep
+  the line of the last route, since Dijkstra's algorithm tracks a single line per station.
+
+  :param: routes is columns of london underground routes as undirected edges
+  :param: stations is columns of stations with latitude and longitude
+  :return: graph of CSR arrays with parallel arrays of station coordinates, weights in cm
+  '''
+  ids, lat, lon = stations.id, stations.lat, stations.lon
+  index = {station_id: v for v, station_id in enumerate(ids)}
+  u = [index[station_id] for station_id in routes.station1]
+  v = [index[station_id] for station_id in routes.station2]
+
+  # Calculate distance once per undirected edge then list every edge in both directions, where
+  # edges 2i and 2i + 1 are route i so edge order follows route order
+  d_km = dist_km_vec([lat[i] for i in u], [lon[i] for i in u], [lat[j] for j in v],
+                     [lon[j] for j in v])
+  src, dst, weights, line_ids = ([0] * (2 * len(u)) for _ in range(4))
+  src[0::2] = dst[1::2] = u
+  src[1::2] = dst[0::2] = v
+  weights[0::2] = weights[1::2] = [round(d * 100_000) for d in d_km]  # convert km to integer cm
+  line_ids[0::2] = line_ids[1::2] = routes.line
+
+  # Stable sort edges by (source, destination) vertex and keep last route of each station pair,
+  # then count edges of each vertex for offsets into edges
+  n = len(ids)
+  order = sorted(range(len(src)), key=lambda k: src[k] * n + dst[k])
+  order = [k for k, k_next in zip(order, order[1:] + [-1])
+           if k_next == -1 or src[k] != src[k_next] or dst[k] != dst[k_next]]
+  counts = [0] * n
+  for k in order:
+    counts[src[k]] += 1
+  indptr = [0, *accumulate(counts)]
+  return Graph(ids, index, indptr, [dst[k] for k in order], [weights[k] for k in order],
+               [line_ids[k] for k in order], lat, lon)
+
+
+def _dijkstra_csr(indptr: list[int], neighbors: list[int], weights: list[int],
+                  line_ids: list[int], start: int, penalty: int) -> tuple[list, list]:
+  '''
+  Dijkstra's algorithm kernel over CSR arrays using only dense vertex ids. Arrays and heap
+  functions are passed in or bound as local variables so the hot loop avoids attribute and global
+  lookups. Heap entries carry the line taken to reach each vertex so checking for a transfer is a
+  single comparison against the line of the next edge. Edges from start are relaxed before the
+  main loop since they never have a transfer penalty, so the loop needs no check for start. Edge
+  weights are integers so distances are summed and compared exactly, including the penalty.
+
+  :param: indptr, neighbors, weights, line_ids are CSR arrays of graph
+  :param: start = starting vertex, penalty = extra percent of edge weight after line transfer
+  :return: list of shortest distances in cm and list of previous vertex (-1 if none) by vertex
+  '''
+  heappush, heappop = heapq.heappush, heapq.heappop
+
   # Initialize local variables for storing info about shortest weighted path
-  dist = {v: inf for v in g}  # store min dist path to vertex from start
-  prev = {v: None for v in g}  # store previous vertex with min edge dist
-  pq = PriorityQueue()  # priority queue or min heap data structure
-  penalty = 1.33  # assume transfer penalty is an extra 0.33 distance stop
+  n = len(indptr) - 1
+  dist = [inf] * n  # store min dist path to vertex from start
+  prev = [-1] * n  # store previous vertex with min edge dist
+  pq = []  # priority queue or min heap data structure
 
-  # Start Dijkstra's Algorithm
+  # Start Dijkstra's Algorithm by relaxing edges from start since first edge has no penalty
   dist[start] = 0  # set distance from start to start as 0
-  pq.put((0, start))  # enqueque
-  while not pq.empty():
-    length, node = pq.get()  # dequeue
-    for neighbor in routes[node]:  # routes is module scoped variable
-      d_km = dist_km(stations[node]['lat'], stations[node]['lon'],
-                     stations[neighbor]['lat'], stations[neighbor]['lon'])
-
-      # Check if previous node exists and if line transfer from current node to neighbor
-      if (prev_n := prev.get(node, None)) and g[prev_n][node] != g[node][neighbor]:
-        new_dist = length + d_km * penalty  # issue transfer penalty
-      else:
-        new_dist = length + d_km
+  for k in range(indptr[start], indptr[start + 1]):
+    neighbor, w, line_id = neighbors[k], weights[k], line_ids[k]
+    if w < dist[neighbor]:
+      dist[neighbor] = w
+      prev[neighbor] = start
+      heappush(pq, (w, neighbor, line_id))  # enqueque
+  while pq:
+    length, node, incoming = heappop(pq)  # dequeue with line taken to reach current node
+    if length > dist[node]:  # skip stale entry since node was already reached by shorter path
+      continue
+    for k in range(indptr[node], indptr[node + 1]):
+      neighbor, w, line_id = neighbors[k], weights[k], line_ids[k]
+
+      # Issue transfer penalty if line transfers from current node to neighbor
+      new_dist = length + w + w * penalty // 100 if incoming != line_id else length + w
 
       # If new distance is new minimum path then update variables and add to pqueue
       if new_dist < dist[neighbor]:
         dist[neighbor] = new_dist
         prev[neighbor] = node
-        pq.put((new_dist, neighbor))
+        heappush(pq, (new_dist, neighbor, line_id))
+  return dist, prev
+
+
+def _astar_csr(indptr: list[int], neighbors: list[int], weights: list[int], line_ids: list[int],
+               lat: list[float], lon: list[float], start: int, end: int,
+               penalty: int) -> tuple[float, list[int], list[int]]:
+  '''
+  A* search kernel over CSR arrays using only dense vertex ids. Same as Dijkstra's algorithm except
+  heap is ordered by distance from start plus straight line distance to end, so search is pulled
+  towards end instead of expanding in every direction, and stops as soon as end is dequeued.
+
+  Straight line distance never overestimates remaining distance since edge weights are straight
+  line distances between stations and transfer penalty only adds to them, so it needs no scaling
+  by penalty. It is only reduced by 0.1% to absorb rounding of edge weights to whole cm and the
+  equirectangular approximation. Straight line distance is calculated when a vertex is first
+  reached, so vertices the search never touches cost nothing.
+
+  :param: indptr, neighbors, weights, line_ids are CSR arrays of graph
+  :param: lat, lon are coordinates of each vertex
+  :param: start = starting vertex, end = ending vertex
+  :param: penalty = extra percent of edge weight after line transfer
+  :return: shortest distance in cm (inf if unreachable), list of vertices for shortest path,
+  list of line id for each edge along shortest path
+  '''
+  heappush, heappop = heapq.heappush, heapq.heappop
+
+  # Initialize local variables for storing info about shortest weighted path
+  n = len(indptr) - 1
+  dist = [inf] * n  # store min dist path to vertex from start
+  prev = [-1] * n  # store previous vertex with min edge dist
+  line = [-1] * n  # store line taken from previous vertex
+  h = [-1] * n  # store lower bound of distance from vertex to end, -1 if not calculated yet
+  end_lat, end_lon = lat[end], lon[end]
+
+  # Start A* search from start, where heap entries are (dist + h, vertex)
+  dist[start] = 0
+  h[start] = int(dist_km(lat[start], lon[start], end_lat, end_lon) * 99_900)  # km to cm less 0.1%
+  pq = [(h[start], start)]  # priority queue or min heap
+  while pq:
+    estimate, node = heappop(pq)  # dequeue
+    if node == end:  # end is settled so its distance is final
+      break
+    length = dist[node]
+    if estimate > length + h[node]:  # skip stale entry since node was reached by shorter path
+      continue
+    incoming = line[node]
+    for k in range(indptr[node], indptr[node + 1]):
+      neighbor, w, line_id = neighbors[k], weights[k], line_ids[k]
+      new_dist = length + w
+      if incoming != -1 and incoming != line_id:
+        new_dist += w * penalty // 100  # issue transfer penalty on edge after transfer
+
+      # If new distance is new minimum path then update variables and add to pqueue by estimate
+      if new_dist < dist[neighbor]:
+        if h[neighbor] == -1:
+          h[neighbor] = int(dist_km(lat[neighbor], lon[neighbor], end_lat, end_lon) * 99_900)
+        dist[neighbor] = new_dist
+        prev[neighbor] = node
+        line[neighbor] = line_id
+        heappush(pq, (new_dist + h[neighbor], neighbor))
 
-  # Reconstruct Path
-  path = [end]
-  while path[-1] in prev:
-    path.append(prev[path[-1]])
-  path.pop()  # the last append at the start_vertex adds None so remove it
+  if dist[end] == inf:  # end is not reachable from start
+    return inf, [], []
 
-  # Return dictionary of min distances and shortest path as list
-  return dist, list(reversed(path))
+  # Reconstruct Path and lines taken by walking back from end
+  path, lines, cur = [], [], end
+  while cur != -1:
+    path.append(cur)
+    lines.append(line[cur])  # line into cur
+    cur = prev[cur]
+  lines.pop()  # start has no line into it
+  path.reverse()
+  lines.reverse()
+  return dist[end], path, lines
 
 
-def directions(routes: dict[int, dict], path: list[int]) -> dict[tuple[int, int], list[int]]:
+@lru_cache(maxsize=512)
+def shortest_path_tree(g: Graph, start: int) -> tuple[list[float], list[int]]:
+  '''
+  Run Dijkstra's algorithm from start to every vertex in graph, g, and memoize the resulting
+  shortest path tree by (g, start). Any later query from the same start only needs to walk the
+  tree, so returned values are shared between calls and must not be modified.
+
+  :param: g is graph of london underground routes in CSR format
+  :param: start = starting vertex
+  :return: list of shortest distances in cm and list of previous vertex (-1 if none) by vertex
+  '''
+  penalty = 33  # assume transfer penalty is an extra 33% distance stop
+  return _dijkstra_csr(g.indptr, g.neighbors, g.weights, g.line_ids, start, penalty)
+
+
+@lru_cache(maxsize=4096)
+def graph_dijkstra(g: Graph, start: int, end: int) -> tuple[float, list[int], list[int]]:
+  '''
+  Use min heap (priority queue) for A* search, Dijkstra's algorithm guided by straight line
+  distance to end, to traverse graph, g, and find shortest weighted path. Assume a transfer
+  penalty and use geographical distance for edge weights. Search heads towards end and stops once
+  end is reached instead of expanding every vertex. Use shortest_path_tree instead for many
+  queries from the same start.
+
+  Results are memoized by (g, start, end) and returned values must not be modified. Routes are
+  not symmetric since the transfer penalty applies to the edge after a transfer, so (start, end)
+  and (end, start) are cached separately.
+
+  :param: g is graph of london underground routes in CSR format
+  :param: start = starting station, end = ending station
+  :return: shortest distance in cm, list stations for shortest path, list line id of each edge
+  '''
+  penalty = 33  # assume transfer penalty is an extra 33% distance stop
+
+  # Translate station ids to dense vertex ids and run A* search
+  start, end = g.index[start], g.index[end]
+  distance, path, lines = _astar_csr(g.indptr, g.neighbors, g.weights, g.line_ids, g.lat, g.lon,
+                                     start, end, penalty)
+
+  # Return shortest distance, shortest path of station ids and lines taken as lists
+  return distance, [g.ids[v] for v in path], lines
+
+
+def directions(path_lines: list[int], path: list[int]) -> dict[tuple[int, int], list[int]]:
   '''
   Formats shortest unweighted path and prints out directions: one train per line towards next stop
   and finishing at final stop before transfer or end. List number of stops and if 1 stop combine
@@ -157,24 +375,15 @@ def directions(routes: dict[int, dict], path: list[int]) -> dict[tuple[int, int]
   "Train Line" to "Final Stop if Next Stop is Final Stop"
   "Next Train Line" towards "Next Stop" to "Final Stop" ("Number of Stops")
 
-  :param: routes is adjacency list of london underground routes
+  :param: path_lines is line id of each edge along path from Dijkstra's algorithm
   :param: path is shortest unweighted path from Dijkstra's algorithm
   :return: dictionary of transfers and number of stops
   '''
-  directions = ddict(list)
-  transfer_number = 0  # mark transfer number, useful when there are revisited lines
-  line_id = routes[path[0]][path[1]]  # NOTE routes is module scoped variable
-  transfer = (transfer_number, line_id)  # use as key for directions
-  for i in range(len(path) - 1):
-    current_stop, next_stop = path[i], path[i + 1]
-    if (next_line := routes[current_stop][next_stop]) == line_id:  # check if next line is transfer
-      directions[transfer].append(next_stop)
-    else:
-      transfer_number += 1
-      line_id = next_line
-      transfer = (transfer_number, line_id)  # update transfer
-      directions[transfer].append(next_stop)
-  return dict(directions)
+  # Split path into runs of consecutive edges on same line, where a new run is a transfer. Key by
+  # transfer number as well as line id, which is useful when there are revisited lines
+  next_stops = iter(path[1:])
+  return {(transfer_number, line_id): [next(next_stops) for _ in run]
+          for transfer_number, (line_id, run) in enumerate(groupby(path_lines))}
 
 
 # Require 2 user arguments for start and end vertex for Dijkstra's Algorithm to calculate
@@ -183,15 +392,16 @@ if __name__ == '__main__':
   import sys  # extract command line arguments
   from colors import color  # ANSI color for text aka foregorund (fg) or background (bg)
 
-  # Store london underground data into dictionaries of dictionaries
+  # Store london underground lines into dictionary, stations and routes into columns
   lines = ImportCSV.lines(r'datasets/lines.csv')
   stations = ImportCSV.stations(r'datasets/stations.csv')
   routes = ImportCSV.routes(r'datasets/routes.csv')
+  graph = build_graph(routes, stations)  # precompute edge weights
 
   # Get user input and check if 2 arguments given and if names are valid
   try:
     start_vertex, end_vertex = sys.argv[1], sys.argv[2]  # recall sys.argv stores input as str
-    station_names = {station['name']: id for id, station in stations.items()}  # ordered set
+    station_names = dict(zip(stations.name, stations.id))  # ordered set
     # check if station name is valid
     start_id = station_names[start_vertex]
     end_id = station_names[end_vertex]
@@ -207,17 +417,18 @@ if __name__ == '__main__':
     sys.exit()
 
   # Dijkstra's Algorithm to calc shortest weighted path between two stations
-  distances, path = graph_dijkstra(routes, start_id, end_id)
+  names = dict(zip(stations.id, stations.name))  # look up station name by id
+  distance, path, path_lines = graph_dijkstra(graph, start_id, end_id)
 
   # Create Dictionary where key is every transfer along path
-  transfers = directions(routes, path)
+  transfers = directions(path_lines, path)
 
   # Print Out from `Transfers` in Readable Format with Colors
   for transfer, line in transfers:
-    color_bg = '#' + lines[line]['colour']  # format string to hex color by prepending '#'
-    name = lines[line]['name']  # get name of line
+    color_bg = '#' + lines[line].colour  # format string to hex color by prepending '#'
+    name = lines[line].name  # get name of line
     if len(stops := transfers[(transfer, line)]) > 1:  # if next stop is not final stop
-      print(color(name, bg=color_bg), f"towards {stations[stops[0]]['name']}", end=' ')
-      print(f"to {stations[stops[-1]]['name']} ({len(stops)} stops)")
+      print(color(name, bg=color_bg), f"towards {names[stops[0]]}", end=' ')
+      print(f"to {names[stops[-1]]} ({len(stops)} stops)")
     else:
-      print(color(name, bg=color_bg), f"to {stations[stops[-1]]['name']}")
+      print(color(name, bg=color_bg), f"to {names[stops[-1]]}")